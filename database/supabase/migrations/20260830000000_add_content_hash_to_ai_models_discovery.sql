@@ -0,0 +1,5 @@
+-- Add content_hash for the API gateway's diff-based replace strategy.
+-- The gateway hashes each incoming model row and only upserts rows whose
+-- hash differs from the stored one.
+ALTER TABLE ai_models_discovery
+  ADD COLUMN IF NOT EXISTS content_hash text;
@@ -0,0 +1,35 @@
+-- Server-side bulk replace for the API gateway's clear-and-rebuild path.
+-- One RPC call replaces the delete + per-100-row insert loop, so the whole
+-- replace happens in a single transaction and a single HTTP round trip.
+CREATE OR REPLACE FUNCTION bulk_replace_models(payload jsonb, clear_existing boolean DEFAULT true)
+RETURNS integer
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+DECLARE
+  cols text;
+  inserted integer;
+BEGIN
+  IF clear_existing THEN
+    DELETE FROM ai_models_discovery;
+  END IF;
+
+  -- Insert only the columns present in the payload, like PostgREST's
+  -- .insert() does, so absent columns (notably the identity id) take
+  -- their defaults instead of explicit NULLs
+  SELECT string_agg(quote_ident(key), ', ')
+    INTO cols
+    FROM jsonb_object_keys(payload->0) AS t(key);
+
+  EXECUTE format(
+    'INSERT INTO ai_models_discovery (%s) SELECT %s FROM jsonb_populate_recordset(null::ai_models_discovery, $1)',
+    cols, cols
+  ) USING payload;
+
+  GET DIAGNOSTICS inserted = ROW_COUNT;
+  RETURN inserted;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION bulk_replace_models(jsonb, boolean) FROM public;
+GRANT EXECUTE ON FUNCTION bulk_replace_models(jsonb, boolean) TO service_role;
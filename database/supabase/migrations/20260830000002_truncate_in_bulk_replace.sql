@@ -0,0 +1,34 @@
+-- Clear via TRUNCATE instead of a full-table DELETE. DELETE logs every row
+-- to WAL and leaves dead tuples for vacuum; TRUNCATE reclaims the heap in
+-- one operation, which matters when the whole table is rewritten on every
+-- replace. SECURITY DEFINER runs as the function owner, which holds the
+-- TRUNCATE privilege.
+CREATE OR REPLACE FUNCTION bulk_replace_models(payload jsonb, clear_existing boolean DEFAULT true)
+RETURNS integer
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+DECLARE
+  cols text;
+  inserted integer;
+BEGIN
+  IF clear_existing THEN
+    TRUNCATE ai_models_discovery;
+  END IF;
+
+  -- Insert only the columns present in the payload, like PostgREST's
+  -- .insert() does, so absent columns (notably the identity id) take
+  -- their defaults instead of explicit NULLs
+  SELECT string_agg(quote_ident(key), ', ')
+    INTO cols
+    FROM jsonb_object_keys(payload->0) AS t(key);
+
+  EXECUTE format(
+    'INSERT INTO ai_models_discovery (%s) SELECT %s FROM jsonb_populate_recordset(null::ai_models_discovery, $1)',
+    cols, cols
+  ) USING payload;
+
+  GET DIAGNOSTICS inserted = ROW_COUNT;
+  RETURN inserted;
+END;
+$$;
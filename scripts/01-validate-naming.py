@@ -10,15 +10,34 @@ import sys
 import yaml
 from pathlib import Path
 
+# Prefer the C-accelerated loader when libyaml bindings are available
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# Parsed-config cache keyed on (mtime, size) so repeated calls skip the
+# YAML re-parse when the file is unchanged
+_YAML_CACHE = {}
+
 def load_config():
     """Load naming configuration from YAML file."""
     config_path = Path("50-scripts/02-naming-config.yml")
     if config_path.exists():
+        st = os.stat(config_path)
+        key = (st.st_mtime, st.st_size)
+        cached = _YAML_CACHE.get(str(config_path))
+        if cached and cached[:2] == key:
+            return cached[2]
+
         with open(config_path, 'r') as f:
-            return yaml.safe_load(f)
+            config = _compile_patterns(yaml.load(f, Loader=_YamlLoader))
+
+        _YAML_CACHE[str(config_path)] = (st.st_mtime, st.st_size, config)
+        return config
 
     # Default configuration if file doesn't exist
-    return {
+    return _compile_patterns({
         'folder_patterns': {
             'required_prefix': r'^\d{2}-[a-z][a-z0-9-]*$',
             'allowed_folders': [
@@ -36,20 +55,21 @@ def load_config():
             '.pytest_cache', '.mypy_cache', 'dist', 'build'
         ],
         'enforcement_level': 'error'  # 'error', 'warn', 'off'
-    }
-
-def is_excluded(path, exclusions):
-    """Check if path should be excluded from validation."""
-    path_str = str(path)
-    for exclusion in exclusions:
-        if exclusion in path_str:
-            return True
-    return False
+    })
+
+def _compile_patterns(config):
+    """Compile naming regexes once so validators skip per-call re-compilation."""
+    config['_folder_re'] = re.compile(config['folder_patterns']['required_prefix'])
+    config['_file_re'] = re.compile(config['file_patterns']['required_prefix'])
+    # Exclusions match on exact basenames, so an O(1) set lookup replaces
+    # substring scans over the full path (and their false positives)
+    config['exclusions'] = frozenset(config['exclusions'])
+    config['file_patterns']['allowed_extensions'] = frozenset(config['file_patterns']['allowed_extensions'])
+    return config
 
 def is_legacy_exempted(path, legacy_exemptions):
     """Check if file is exempt from naming rules."""
-    file_name = Path(path).name
-    return file_name in legacy_exemptions
+    return os.path.basename(path) in legacy_exemptions
 
 def is_legacy_folder_exempted(folder_name, legacy_folder_exemptions):
     """Check if folder is exempt from naming rules."""
@@ -57,68 +77,84 @@ def is_legacy_folder_exempted(folder_name, legacy_folder_exemptions):
 
 def validate_folder_name(folder_name, config):
     """Validate folder naming convention."""
-    pattern = config['folder_patterns']['required_prefix']
-    return re.match(pattern, folder_name) is not None
+    return config['_folder_re'].match(folder_name) is not None
 
 def validate_file_name(file_name, config):
     """Validate file naming convention."""
-    pattern = config['file_patterns']['required_prefix']
     allowed_extensions = config['file_patterns']['allowed_extensions']
 
     # Check if file has correct prefix pattern
-    if not re.match(pattern, file_name):
+    if not config['_file_re'].match(file_name):
         return False
 
     # Check if file has allowed extension
-    file_ext = Path(file_name).suffix
+    file_ext = os.path.splitext(file_name)[1]
     return file_ext in allowed_extensions
 
-def scan_directory(root_path, config):
-    """Scan directory for naming convention violations."""
-    violations = []
-
-    for root, dirs, files in os.walk(root_path):
-        root_path_obj = Path(root)
-
-        # Skip excluded directories
-        if is_excluded(root_path_obj, config['exclusions']):
-            continue
+def _scandir_recursive(path, exclusions):
+    """Recursively yield (entry, is_dir) pairs, pruning excluded directories.
+
+    Uses os.scandir so the dir/file type comes from the cached DirEntry
+    instead of extra stat() calls per entry.
+    """
+    try:
+        it = os.scandir(path)
+    except OSError:
+        return
+
+    with it:
+        for entry in it:
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
 
-        # Validate folder names (skip root directory)
-        if root != '.':
-            for dir_name in dirs:
-                if is_excluded(Path(root) / dir_name, config['exclusions']):
+            if is_dir:
+                # Prune excluded directories before descending
+                if entry.name in exclusions:
                     continue
+                yield entry, True
+                yield from _scandir_recursive(entry.path, exclusions)
+            else:
+                yield entry, False
 
-                # Skip legacy exempted folders
-                legacy_folder_exemptions = config.get('legacy_folder_exemptions', [])
-                if is_legacy_folder_exempted(dir_name, legacy_folder_exemptions):
-                    continue
 
-                if not validate_folder_name(dir_name, config):
-                    violations.append({
-                        'type': 'folder',
-                        'path': str(Path(root) / dir_name),
-                        'issue': f"Folder '{dir_name}' doesn't match pattern: {config['folder_patterns']['required_prefix']}"
-                    })
+def scan_directory(root_path, config):
+    """Scan directory for naming convention violations."""
+    violations = []
+    exclusions = config['exclusions']
+    legacy_exemptions = config.get('legacy_exemptions', [])
+    legacy_folder_exemptions = config.get('legacy_folder_exemptions', [])
+
+    for entry, is_dir in _scandir_recursive(root_path, exclusions):
+        if is_dir:
+            # Validate folder names (skip folders directly under the root)
+            if os.path.dirname(entry.path) == root_path:
+                continue
 
-        # Validate file names
-        for file_name in files:
-            file_path = Path(root) / file_name
+            # Skip legacy exempted folders
+            if is_legacy_folder_exempted(entry.name, legacy_folder_exemptions):
+                continue
 
-            if is_excluded(file_path, config['exclusions']):
+            if not validate_folder_name(entry.name, config):
+                violations.append({
+                    'type': 'folder',
+                    'path': entry.path,
+                    'issue': f"Folder '{entry.name}' doesn't match pattern: {config['folder_patterns']['required_prefix']}"
+                })
+        else:
+            if entry.name in exclusions:
                 continue
 
             # Skip hidden files and legacy exempted files
-            legacy_exemptions = config.get('legacy_exemptions', [])
-            if file_name.startswith('.') or is_legacy_exempted(file_path, legacy_exemptions):
+            if entry.name.startswith('.') or is_legacy_exempted(entry.name, legacy_exemptions):
                 continue
 
-            if not validate_file_name(file_name, config):
+            if not validate_file_name(entry.name, config):
                 violations.append({
                     'type': 'file',
-                    'path': str(file_path),
-                    'issue': f"File '{file_name}' doesn't match naming convention"
+                    'path': entry.path,
+                    'issue': f"File '{entry.name}' doesn't match naming convention"
                 })
 
     return violations
@@ -145,7 +181,7 @@ def main():
         print("📋 Expected Naming Conventions:")
         print(f"   📁 Folders: {config['folder_patterns']['required_prefix']}")
         print(f"   📄 Files: {config['file_patterns']['required_prefix']}")
-        print(f"   📎 Extensions: {', '.join(config['file_patterns']['allowed_extensions'])}")
+        print(f"   📎 Extensions: {', '.join(sorted(config['file_patterns']['allowed_extensions']))}")
         print()
         print("💡 Examples:")
         print("   ✅ 10-documentation/01-project-overview.txt")
@@ -9,16 +9,35 @@ import sys
 import yaml
 from pathlib import Path
 
+# Prefer the C-accelerated loader when libyaml bindings are available
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# Parsed-config cache keyed on (mtime, size) so repeated calls skip the
+# YAML re-parse when the file is unchanged
+_YAML_CACHE = {}
+
 def load_config():
     """Load extension validation configuration."""
     config_path = Path("50-scripts/02-naming-config.yml")
     if config_path.exists():
+        st = os.stat(config_path)
+        key = (st.st_mtime, st.st_size)
+        cached = _YAML_CACHE.get(str(config_path))
+        if cached and cached[:2] == key:
+            return cached[2]
+
         with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
-            return config.get('folder_type_rules', {})
+            config = yaml.load(f, Loader=_YamlLoader)
+            folder_rules = _freeze_rules(config.get('folder_type_rules', {}))
+
+        _YAML_CACHE[str(config_path)] = (st.st_mtime, st.st_size, folder_rules)
+        return folder_rules
 
     # Default folder type rules
-    return {
+    return _freeze_rules({
         '10-documentation': ['.txt', '.md'],
         '20-architecture': ['.txt', '.md', '.json', '.yml', '.yaml'],
         '30-configuration': ['.ts', '.js', '.json', '.yml', '.yaml', '.env'],
@@ -28,33 +47,57 @@ def load_config():
         '70-testing': ['.py', '.js', '.ts', '.json', '.yml', '.yaml'],
         '80-deployment': ['.yml', '.yaml', '.json', '.sh', '.dockerfile'],
         '90-utilities': ['.py', '.js', '.ts', '.sh', '.json', '.yml', '.yaml']
-    }
+    })
+
+def _freeze_rules(folder_rules):
+    """Convert each extension list to a frozenset for O(1) membership tests."""
+    return {folder: frozenset(extensions) for folder, extensions in folder_rules.items()}
+
+def _iter_files(root):
+    """Recursively yield DirEntry objects for regular files under root.
+
+    os.scandir reuses the cached type info from readdir, avoiding the
+    extra stat() calls rglob issues per entry.
+    """
+    try:
+        it = os.scandir(root)
+    except OSError:
+        return
+
+    with it:
+        for entry in it:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from _iter_files(entry.path)
+                elif entry.is_file():
+                    yield entry
+            except OSError:
+                continue
 
 def validate_folder_extensions(root_path, folder_rules):
     """Validate file extensions within specific folder types."""
     violations = []
 
     for folder_name, allowed_extensions in folder_rules.items():
-        folder_path = Path(root_path) / folder_name
+        folder_path = os.path.join(root_path, folder_name)
 
-        if not folder_path.exists():
+        if not os.path.isdir(folder_path):
             continue
 
-        for file_path in folder_path.rglob('*'):
-            if file_path.is_file():
-                file_extension = file_path.suffix
+        for entry in _iter_files(folder_path):
+            # Skip hidden files and special files
+            if entry.name.startswith('.'):
+                continue
 
-                # Skip hidden files and special files
-                if file_path.name.startswith('.'):
-                    continue
+            file_extension = os.path.splitext(entry.name)[1]
 
-                if file_extension not in allowed_extensions:
-                    violations.append({
-                        'folder': folder_name,
-                        'file': str(file_path),
-                        'extension': file_extension,
-                        'allowed': allowed_extensions
-                    })
+            if file_extension not in allowed_extensions:
+                violations.append({
+                    'folder': folder_name,
+                    'file': entry.path,
+                    'extension': file_extension,
+                    'allowed': allowed_extensions
+                })
 
     return violations
 
@@ -72,12 +115,12 @@ def main():
             print(f"❌ FILE: {violation['file']}")
             print(f"   Folder: {violation['folder']}")
             print(f"   Extension: {violation['extension']}")
-            print(f"   Allowed: {', '.join(violation['allowed'])}")
+            print(f"   Allowed: {', '.join(sorted(violation['allowed']))}")
             print()
 
         print("📋 Folder Type Rules:")
         for folder, extensions in folder_rules.items():
-            print(f"   📁 {folder}: {', '.join(extensions)}")
+            print(f"   📁 {folder}: {', '.join(sorted(extensions))}")
 
         return 1
 
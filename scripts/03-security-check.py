@@ -7,6 +7,7 @@ Checks for common security anti-patterns and vulnerabilities in code files.
 import sys
 import os
 import re
+import concurrent.futures
 from typing import List, Dict, Tuple
 from pathlib import Path
 
@@ -194,24 +195,72 @@ ALLOWLIST_PATTERNS = [
     r"describe\(|it\(|expect\(",  # Test code
 ]
 
+# Fused into one alternation at import time so each allowlist check is a
+# single regex scan instead of one search per pattern
+ALLOWLIST_RE = re.compile("|".join(f"(?:{p})" for p in ALLOWLIST_PATTERNS), re.IGNORECASE)
+
+
+def _group_patterns_by_ext() -> Dict[str, List[SecurityPattern]]:
+    """Index SECURITY_PATTERNS by file extension once at import time."""
+    by_ext: Dict[str, List[SecurityPattern]] = {}
+    for pattern in SECURITY_PATTERNS:
+        for ext in pattern.file_types:
+            by_ext.setdefault(ext, []).append(pattern)
+    return by_ext
+
+
+# Extension -> applicable patterns, so per-file scans never iterate (and
+# discard) patterns for other file types
+PATTERNS_BY_EXT = _group_patterns_by_ext()
+
+
+def _build_combined_patterns() -> Dict[str, re.Pattern]:
+    """Union the per-extension patterns into one prefilter alternation.
+
+    The combined regex only decides whether a line needs scanning at all;
+    flagged lines are then scanned with each pattern's own regex, because
+    an alternation yields non-overlapping matches and would drop findings
+    that overlap an earlier, greedier alternative on the same line.
+    """
+    return {
+        ext: re.compile(
+            "|".join(f"(?:{p.pattern.pattern})" for p in grouped),
+            re.IGNORECASE | re.MULTILINE
+        )
+        for ext, grouped in PATTERNS_BY_EXT.items()
+    }
+
+
+COMBINED_BY_EXT = _build_combined_patterns()
+
+# Cheap bytes-level pre-filter: every security pattern requires at least one
+# of these sequences, so files without them skip utf-8 decode and regex work.
+# The set must stay a superset of what SECURITY_PATTERNS can match — note the
+# bare "+" needed by the concatenation alternatives of dynamic-sql and
+# file-inclusion, and the SQL keywords for sql-injection-risk.
+_TRIGGER_RE = re.compile(
+    rb"password|pwd|pass|api|secret|token|eyJ|://|eval|exec|Function|input\(|"
+    rb"pickle|innerHTML|Math\.random|\.\./|require|import|include|readFile|"
+    rb"debug|console\.log|md5|sha1|des|rc4|"
+    rb"select|insert|update|delete|query|\+",
+    re.IGNORECASE
+)
+
+# Files larger than this are skipped outright (minified bundles, source maps)
+_MAX_SCAN_BYTES = 1 << 20
+
 
 def get_file_extension(filepath: str) -> str:
     """Get the file extension without the dot."""
-    return Path(filepath).suffix.lstrip('.')
+    return os.path.splitext(filepath)[1].lstrip('.')
 
 
-def is_allowlisted_line(line: str, filepath: str = "") -> bool:
-    """Check if a line should be ignored due to allowlist patterns."""
-    line_clean = line.strip().lower()
-    filepath_clean = filepath.lower()
+def is_allowlisted_line(line: str) -> bool:
+    """Check if a line should be ignored due to allowlist patterns.
 
-    for pattern_str in ALLOWLIST_PATTERNS:
-        if re.search(pattern_str, line_clean, re.IGNORECASE):
-            return True
-        if re.search(pattern_str, filepath_clean, re.IGNORECASE):
-            return True
-
-    return False
+    Filepath allowlisting is handled once per file in check_file_security.
+    """
+    return bool(ALLOWLIST_RE.search(line))
 
 
 def check_file_security(filepath: str) -> List[Tuple[str, int, str, str]]:
@@ -223,33 +272,59 @@ def check_file_security(filepath: str) -> List[Tuple[str, int, str, str]]:
     if not os.path.exists(filepath):
         return []
 
+    # An allowlisted filepath suppresses every finding - test it once here
+    # instead of per match inside the scan loop
+    if ALLOWLIST_RE.search(filepath):
+        return []
+
     file_ext = get_file_extension(filepath)
     issues = []
 
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-            lines = content.split('\n')
-    except (UnicodeDecodeError, IOError) as e:
+        if os.stat(filepath).st_size > _MAX_SCAN_BYTES:
+            return []
+
+        with open(filepath, 'rb') as f:
+            # NUL byte in the head means binary - skip without reading the rest
+            head = f.read(4096)
+            if b'\x00' in head:
+                return []
+            raw = head + f.read()
+    except IOError as e:
         print(f"Warning: Could not read file {filepath}: {e}")
         return []
 
-    for pattern in SECURITY_PATTERNS:
-        # Skip if file type doesn't match
-        if file_ext not in pattern.file_types:
-            continue
+    # Early-reject before paying for the utf-8 decode
+    if not _TRIGGER_RE.search(raw):
+        return []
+
+    try:
+        content = raw.decode('utf-8')
+    except UnicodeDecodeError as e:
+        print(f"Warning: Could not read file {filepath}: {e}")
+        return []
+
+    lines = content.split('\n')
 
-        # Find all matches
-        for match in pattern.pattern.finditer(content):
-            # Find line number
-            line_num = content[:match.start()].count('\n') + 1
-            line_content = lines[line_num - 1] if line_num <= len(lines) else ""
+    combined_re = COMBINED_BY_EXT.get(file_ext)
+    if combined_re is None:
+        return issues
+    patterns = PATTERNS_BY_EXT[file_ext]
 
-            # Skip if line is allowlisted
-            if is_allowlisted_line(line_content, filepath):
-                continue
+    # Line-oriented scan: line numbers fall out of the iteration (no prefix
+    # counting or line-start index needed) and the allowlist check runs at
+    # most once per matching line. None of the patterns span lines. The
+    # combined regex is only a prefilter; flagged lines get a scan per
+    # pattern so overlapping matches all report.
+    for line_num, line_content in enumerate(lines, 1):
+        if not combined_re.search(line_content):
+            continue
+        if is_allowlisted_line(line_content):
+            continue
 
-            issues.append((pattern.severity, line_num, pattern.name, pattern.description))
+        for pattern in patterns:
+            for _ in pattern.pattern.finditer(line_content):
+                issues.append((pattern.severity, line_num, pattern.name, pattern.description))
 
     return issues
 
@@ -264,12 +339,16 @@ def main():
     total_warnings = 0
     total_info = 0
 
-    for filepath in sys.argv[1:]:
-        if not os.path.exists(filepath):
-            continue
+    filepaths = [f for f in sys.argv[1:] if os.path.exists(f)]
 
-        issues = check_file_security(filepath)
+    # Scans are independent and I/O-bound, so fan out across a thread pool;
+    # executor.map preserves input order for deterministic reporting
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=min(32, (os.cpu_count() or 4))
+    ) as executor:
+        results = list(executor.map(check_file_security, filepaths))
 
+    for filepath, issues in zip(filepaths, results):
         if issues:
             print(f"\n🔍 Security check: {filepath}")
             print("-" * (20 + len(filepath)))
@@ -7,6 +7,7 @@ Ensures TODOs follow consistent format and are properly tracked.
 import sys
 import os
 import re
+import concurrent.futures
 from typing import List, Tuple, Dict
 from pathlib import Path
 
@@ -104,35 +105,53 @@ FILETYPE_PATTERNS = {
     ]
 }
 
+# Per-extension pattern tuples built once at import time; tuples are
+# immutable so no defensive copy is needed per file
+_DEFAULT_PATTERNS = tuple(TODO_PATTERNS)
+PATTERNS_BY_EXT = {
+    ext: _DEFAULT_PATTERNS + tuple(extra)
+    for ext, extra in FILETYPE_PATTERNS.items()
+}
+
 
 def get_file_extension(filepath: str) -> str:
     """Get the file extension without the dot."""
-    return Path(filepath).suffix.lstrip('.')
+    return os.path.splitext(filepath)[1].lstrip('.')
 
 
-def check_file_todos(filepath: str) -> List[Tuple[str, int, str, str]]:
+def check_file_todos(filepath: str) -> Tuple[List[Tuple[str, int, str, str]], int]:
     """
-    Check a file for TODO format issues.
+    Check a file for TODO format issues in a single read.
 
-    Returns list of (severity, line_number, pattern_name, description) tuples.
+    Returns (issues, todo_count) where issues is a list of
+    (severity, line_number, pattern_name, description) tuples and
+    todo_count is the number of TODO occurrences in the file.
     """
     if not os.path.exists(filepath):
-        return []
+        return [], 0
 
     file_ext = get_file_extension(filepath)
     issues = []
 
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+            content = f.read()
     except (UnicodeDecodeError, IOError) as e:
         print(f"Warning: Could not read file {filepath}: {e}")
-        return []
+        return [], 0
+
+    # Most files contain no TODOs at all - skip the per-line scan entirely
+    lowered = content.lower()
+    if 'todo' not in lowered:
+        return [], 0
+
+    # str.count is a C-level scan; the regex was a literal match anyway
+    todo_count = lowered.count('todo')
+
+    lines = content.splitlines()
 
     # Get patterns for this file type
-    patterns_to_check = TODO_PATTERNS[:]
-    if file_ext in FILETYPE_PATTERNS:
-        patterns_to_check.extend(FILETYPE_PATTERNS[file_ext])
+    patterns_to_check = PATTERNS_BY_EXT.get(file_ext, _DEFAULT_PATTERNS)
 
     for line_num, line in enumerate(lines, 1):
         line_stripped = line.strip()
@@ -163,11 +182,11 @@ def check_file_todos(filepath: str) -> List[Tuple[str, int, str, str]]:
                 "TODO doesn't follow standard format - use: TODO: Description (Task #)"
             ))
 
-    return issues
+    return issues, todo_count
 
 
-def analyze_todo_stats(filepaths: List[str]) -> Dict[str, int]:
-    """Analyze TODO statistics across files."""
+def analyze_todo_stats(issues_by_file: Dict[str, List], todo_counts: Dict[str, int]) -> Dict[str, int]:
+    """Analyze TODO statistics from results already computed in the main pass."""
     stats = {
         'total_todos': 0,
         'valid_todos': 0,
@@ -177,17 +196,7 @@ def analyze_todo_stats(filepaths: List[str]) -> Dict[str, int]:
         'most_todos_count': 0
     }
 
-    for filepath in filepaths:
-        if not os.path.exists(filepath):
-            continue
-
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except (UnicodeDecodeError, IOError):
-            continue
-
-        todo_count = len(re.findall(r'todo', content, re.IGNORECASE))
+    for filepath, todo_count in todo_counts.items():
         if todo_count > 0:
             stats['files_with_todos'] += 1
             stats['total_todos'] += todo_count
@@ -196,9 +205,7 @@ def analyze_todo_stats(filepaths: List[str]) -> Dict[str, int]:
                 stats['most_todos_count'] = todo_count
                 stats['most_todos_file'] = filepath
 
-        # Check for valid TODOs
-        issues = check_file_todos(filepath)
-        stats['invalid_todos'] += len(issues)
+        stats['invalid_todos'] += len(issues_by_file.get(filepath, []))
 
     stats['valid_todos'] = stats['total_todos'] - stats['invalid_todos']
     return stats
@@ -218,11 +225,21 @@ def main():
 
     total_issues = 0
     files_with_issues = 0
+    issues_by_file = {}
+    todo_counts = {}
 
     print("🔍 Checking TODO format compliance...")
 
-    for filepath in filepaths:
-        issues = check_file_todos(filepath)
+    # Checks are independent and I/O-bound, so fan out across a thread pool;
+    # executor.map preserves input order for deterministic reporting
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=min(32, (os.cpu_count() or 4))
+    ) as executor:
+        results = list(executor.map(check_file_todos, filepaths))
+
+    for filepath, (issues, todo_count) in zip(filepaths, results):
+        issues_by_file[filepath] = issues
+        todo_counts[filepath] = todo_count
 
         if issues:
             files_with_issues += 1
@@ -234,8 +251,8 @@ def main():
                 print(f"  {icon} Line {line_num}: {description}")
                 total_issues += 1
 
-    # Generate statistics
-    stats = analyze_todo_stats(filepaths)
+    # Generate statistics from the single pass above
+    stats = analyze_todo_stats(issues_by_file, todo_counts)
 
     print(f"\n📊 TODO Analysis Summary:")
     print(f"   Files checked: {len(filepaths)}")
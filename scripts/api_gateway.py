@@ -1,31 +1,44 @@
 # api_gateway.py - For your Render.com backend
 from flask import Flask, request, jsonify
 import os
+import gzip
+import json
+import hashlib
+import hmac
+import concurrent.futures
 from supabase import create_client
 import logging
 
+# orjson parses large request bodies 2-5x faster than Flask's stdlib json;
+# fall back to the stdlib when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 app = Flask(__name__)
 logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Opt-in verbose startup diagnostics; keep worker boot quiet and fast
+GATEWAY_DEBUG_ENV = os.getenv('GATEWAY_DEBUG_ENV') == '1'
 
 # Use your Render environment variables (match exact case)
 supabase_ai_models_discovery_url = os.getenv('supabase_ai_models_discovery_url')
 service_role = os.getenv('service_role')
 ai_models_discovery_api_secret_key = os.getenv('ai_models_discovery_api_secret_key')
 
-# Log environment variable status for debugging
-import logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
-logger.info(f"Environment check - URL exists: {bool(supabase_ai_models_discovery_url)}")
-logger.info(f"Environment check - Service role exists: {bool(service_role)}")
-logger.info(f"Environment check - API secret exists: {bool(ai_models_discovery_api_secret_key)}")
-if supabase_ai_models_discovery_url:
-    logger.info(f"Supabase URL: {supabase_ai_models_discovery_url}")
-if service_role:
-    logger.info(f"Service role length: {len(service_role)}")
-    logger.info(f"Service role starts with: {service_role[:10]}...")
-    logger.info(f"Service role ends with: ...{service_role[-10:]}")
+if GATEWAY_DEBUG_ENV:
+    # Log environment variable status for debugging
+    logger.info(f"Environment check - URL exists: {bool(supabase_ai_models_discovery_url)}")
+    logger.info(f"Environment check - Service role exists: {bool(service_role)}")
+    logger.info(f"Environment check - API secret exists: {bool(ai_models_discovery_api_secret_key)}")
+    if supabase_ai_models_discovery_url:
+        logger.info(f"Supabase URL: {supabase_ai_models_discovery_url}")
+    if service_role:
+        logger.info(f"Service role length: {len(service_role)}")
+        logger.info(f"Service role starts with: {service_role[:10]}...")
+        logger.info(f"Service role ends with: ...{service_role[-10:]}")
 
 # Validate required environment variables
 if not supabase_ai_models_discovery_url:
@@ -38,43 +51,57 @@ if not ai_models_discovery_api_secret_key:
     app.logger.error("Missing ai_models_discovery_api_secret_key environment variable")
     raise ValueError("ai_models_discovery_api_secret_key environment variable required")
 
-app.logger.info("Environment variables validated successfully")
-
 # Initialize Supabase client with service_role key (secure on Render)
 try:
     # Strip any potential whitespace from the key
     clean_key = service_role.strip() if service_role else ""
     clean_url = supabase_ai_models_discovery_url.strip() if supabase_ai_models_discovery_url else ""
-    
-    logger.info(f"Attempting to create Supabase client with cleaned credentials")
-    logger.info(f"Cleaned URL: {clean_url}")
-    logger.info(f"Cleaned key length: {len(clean_key)}")
-    
+
     supabase = create_client(clean_url, clean_key)
     logger.info("Supabase client initialized successfully")
-    
-    # Test the connection and permissions
-    try:
-        # Try a simple query to verify the key works
-        test_result = supabase.table('ai_models_discovery').select('count', count='exact').limit(1).execute()
-        logger.info("Database connection test successful")
-    except Exception as db_error:
-        logger.warning(f"Database test failed (key might have limited permissions): {str(db_error)}")
-        
+
+    if GATEWAY_DEBUG_ENV:
+        # Test the connection and permissions - costs a startup round trip,
+        # so only when diagnostics are requested
+        try:
+            test_result = supabase.table('ai_models_discovery').select('count', count='exact').limit(1).execute()
+            logger.info("Database connection test successful")
+        except Exception as db_error:
+            logger.warning(f"Database test failed (key might have limited permissions): {str(db_error)}")
+
 except Exception as e:
     logger.error(f"Failed to initialize Supabase client: {str(e)}")
-    logger.error(f"Raw key length: {len(service_role) if service_role else 0}")
     # Don't raise - let the app start and show better error messages
     supabase = None
 
+def parse_request_json():
+    """Decode the request body, preferring orjson for large payloads.
+
+    Accepts gzip-compressed bodies (Content-Encoding: gzip), which the
+    writer client sends for large model payloads.
+    """
+    body = request.get_data()
+    if request.headers.get('Content-Encoding') == 'gzip':
+        body = gzip.decompress(body)
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+def compute_content_hash(model):
+    """Stable hash of a model row for diff-based change detection."""
+    canonical = json.dumps(model, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+# Pre-encoded so verify_api_key compares bytes without re-encoding per call
+_api_secret_key_bytes = ai_models_discovery_api_secret_key.encode()
+
 def verify_api_key():
-    """Verify API key from Authorization header"""
-    auth_header = request.headers.get('Authorization')
-    if not auth_header or not auth_header.startswith('Bearer '):
+    """Verify API key from Authorization header (constant-time comparison)"""
+    auth_header = request.headers.get('Authorization', '')
+    if not auth_header.startswith('Bearer '):
         return False
-    
-    token = auth_header.replace('Bearer ', '')
-    return token == ai_models_discovery_api_secret_key
+
+    return hmac.compare_digest(auth_header[7:].encode(), _api_secret_key_bytes)
 
 @app.route('/health', methods=['GET'])
 def health_check():
@@ -107,37 +134,106 @@ def replace_all_models():
         return jsonify({'error': 'Unauthorized'}), 401
     
     try:
-        models_data = request.json.get('models', [])
+        models_data = parse_request_json().get('models', [])
         
         if not models_data:
             return jsonify({'error': 'No models data provided'}), 400
         
         app.logger.info(f'Starting replace operation with {len(models_data)} models')
-        
-        # Step 1: Clear existing data (clear-and-rebuild strategy)
-        delete_result = supabase.table('ai_models_discovery').delete().neq('id', 0).execute()
-        app.logger.info(f'Cleared existing data')
-        
-        # Step 2: Insert new data in batches of 100
+
+        if all(model.get('id') is not None for model in models_data):
+            # Diff-based replace: only write rows whose content changed and
+            # delete rows whose ids disappeared, instead of clear-and-rebuild.
+            # Page the snapshot — an unranged select is capped at PostgREST's
+            # max-rows (1000 by default), which would truncate the hash map
+            # and leave stale rows alive past the cap. Ordering by id keeps
+            # offset pages stable across requests; unordered pages can shift
+            # and skip or repeat rows.
+            existing_hashes = {}
+            page_size = 1000
+            offset = 0
+            while True:
+                page = supabase.table('ai_models_discovery')\
+                    .select('id,content_hash')\
+                    .order('id')\
+                    .range(offset, offset + page_size - 1)\
+                    .execute()
+                rows = page.data or []
+                for row in rows:
+                    existing_hashes[row['id']] = row.get('content_hash')
+                if len(rows) < page_size:
+                    break
+                offset += page_size
+
+            to_upsert = []
+            incoming_ids = set()
+            for model in models_data:
+                content_hash = compute_content_hash(model)
+                incoming_ids.add(model['id'])
+                if existing_hashes.get(model['id']) != content_hash:
+                    to_upsert.append({**model, 'content_hash': content_hash})
+
+            stale_ids = [row_id for row_id in existing_hashes if row_id not in incoming_ids]
+
+            # Batches are independent, so submit them concurrently; 500-row
+            # batches amortize HTTP framing and 8 workers stay within
+            # Supabase's connection pool
+            batch_size = 500
+            batches = [to_upsert[i:i+batch_size] for i in range(0, len(to_upsert), batch_size)]
+            if batches:
+                def upsert_batch(batch):
+                    # return=minimal: counts are computed client-side, so skip
+                    # having PostgREST serialize the written rows back to us
+                    return supabase.table('ai_models_discovery')\
+                        .upsert(batch, on_conflict='id', returning='minimal').execute()
+
+                with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+                    futures = [executor.submit(upsert_batch, batch) for batch in batches]
+                    for future in concurrent.futures.as_completed(futures):
+                        future.result()
+
+            if stale_ids:
+                supabase.table('ai_models_discovery').delete().in_('id', stale_ids).execute()
+
+            unchanged_count = len(models_data) - len(to_upsert)
+            app.logger.info(
+                f'Diff replace: {len(to_upsert)} upserted, {len(stale_ids)} deleted, '
+                f'{unchanged_count} unchanged'
+            )
+
+            return jsonify({
+                'status': 'success',
+                'operation': 'replace_all',
+                'models_upserted': len(to_upsert),
+                'models_deleted': len(stale_ids),
+                'models_unchanged': unchanged_count
+            })
+
+        # Fallback when models carry no stable ids: clear-and-rebuild via the
+        # bulk_replace_models RPC, which runs DELETE + INSERT in one server-side
+        # transaction. Split only when the payload would exceed PostgREST's
+        # ~8 MB request limit, not per 100 rows.
+        max_rpc_bytes = 8 * 1024 * 1024
+        payload_bytes = len(json.dumps(models_data, default=str).encode())
+        num_chunks = max(1, -(-payload_bytes // max_rpc_bytes))
+        chunk_size = -(-len(models_data) // num_chunks)
+
         inserted_count = 0
-        batch_size = 100
-        
-        for i in range(0, len(models_data), batch_size):
-            batch = models_data[i:i+batch_size]
-            
-            # Insert batch
-            result = supabase.table('ai_models_discovery').insert(batch).execute()
-            inserted_count += len(batch)
-            
-            app.logger.info(f'Inserted batch {i//batch_size + 1}: {len(batch)} models')
-        
-        app.logger.info(f'Successfully replaced all models: {inserted_count} total')
-        
+        for i in range(0, len(models_data), chunk_size):
+            chunk = models_data[i:i+chunk_size]
+            supabase.rpc('bulk_replace_models', {
+                'payload': chunk,
+                'clear_existing': i == 0
+            }).execute()
+            inserted_count += len(chunk)
+
+        app.logger.info(f'Successfully replaced all models: {inserted_count} total in {num_chunks} RPC call(s)')
+
         return jsonify({
             'status': 'success',
             'operation': 'replace_all',
             'models_inserted': inserted_count,
-            'batches_processed': (len(models_data) + batch_size - 1) // batch_size
+            'batches_processed': num_chunks
         })
     
     except Exception as e:
@@ -151,13 +247,13 @@ def insert_staging_data():
         return jsonify({'error': 'Unauthorized'}), 401
     
     try:
-        staging_data = request.json.get('urls', [])
+        staging_data = parse_request_json().get('urls', [])
         
         if not staging_data:
             return jsonify({'error': 'No staging data provided'}), 400
         
-        # Insert staging data
-        result = supabase.table('ai_models_staging').insert(staging_data).execute()
+        # Insert staging data; return=minimal since we count rows client-side
+        supabase.table('ai_models_staging').insert(staging_data, returning='minimal').execute()
         
         return jsonify({
             'status': 'success',
@@ -169,6 +265,58 @@ def insert_staging_data():
         app.logger.error(f'Error in insert_staging_data: {str(e)}')
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/staging/batch', methods=['POST'])
+def staging_batch():
+    """Run dependent staging calls in one request (e.g. insert then process)"""
+    if not verify_api_key():
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    try:
+        calls = parse_request_json().get('calls', [])
+
+        if not calls:
+            return jsonify({'error': 'No calls provided'}), 400
+
+        # Calls execute in list order, so a later call sees the server-side
+        # state left by earlier ones — that ordering is the dependency graph
+        results = []
+        for call in calls:
+            op = call.get('op')
+
+            if op == 'insert':
+                staging_data = call.get('urls', [])
+                if staging_data:
+                    supabase.table('ai_models_staging').insert(staging_data, returning='minimal').execute()
+                results.append({
+                    'operation': 'staging_insert',
+                    'records_inserted': len(staging_data)
+                })
+
+            elif op == 'process':
+                limit = call.get('limit', 10)
+                staging_result = supabase.table('ai_models_staging')\
+                    .select('*')\
+                    .eq('processing_status', 'pending')\
+                    .limit(limit)\
+                    .execute()
+                results.append({
+                    'operation': 'process_staging',
+                    'records_processed': len(staging_result.data)
+                })
+
+            else:
+                return jsonify({'error': f'Unknown op: {op}'}), 400
+
+        return jsonify({
+            'status': 'success',
+            'operation': 'staging_batch',
+            'results': results
+        })
+
+    except Exception as e:
+        app.logger.error(f'Error in staging_batch: {str(e)}')
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/staging/process', methods=['POST'])
 def process_staging_data():
     """Process staging data and move to main table"""
@@ -176,7 +324,7 @@ def process_staging_data():
         return jsonify({'error': 'Unauthorized'}), 401
     
     try:
-        limit = request.json.get('limit', 10)
+        limit = parse_request_json().get('limit', 10)
         
         # Get pending staging records
         staging_result = supabase.table('ai_models_staging')\
@@ -202,4 +350,7 @@ def process_staging_data():
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
-    app.run(host='0.0.0.0', port=port, debug=False)
\ No newline at end of file
+    # Threaded serving keeps health checks and staging calls responsive while
+    # a long replace operation waits on Supabase I/O. In production run a
+    # threaded WSGI server, e.g.: gunicorn --threads 8 api_gateway:app
+    app.run(host='0.0.0.0', port=port, debug=False, threaded=True)
\ No newline at end of file
@@ -1,12 +1,34 @@
 # apollo_agent_integration.py - Integration for Apollo Agent with API Gateway
 from writer_agent_client import WriterAgentClient
 import logging
+import time
 
 class ApolloAgentIntegration:
+    # How long a successful health probe stays trusted before re-probing
+    _HEALTH_TRUST_SECONDS = 60
+
     def __init__(self):
         self.writer_client = WriterAgentClient()
         self.logger = logging.getLogger(__name__)
-    
+        self._healthy_until = 0.0
+
+    def _gateway_healthy(self):
+        """Check gateway health, trusting a recent successful probe.
+
+        Avoids paying a health-check round trip before every real call;
+        a failed real call resets the trust window so the next call
+        re-probes.
+        """
+        now = time.monotonic()
+        if now < self._healthy_until:
+            return True
+
+        if self.writer_client.health_check():
+            self._healthy_until = now + self._HEALTH_TRUST_SECONDS
+            return True
+
+        return False
+
     def process_and_store_models(self, processed_models_data):
         """
         Process models from Apollo Agent and store via API Gateway
@@ -29,17 +51,19 @@ class ApolloAgentIntegration:
             # Log the operation
             self.logger.info(f"Processing {len(processed_models_data)} models via API Gateway")
             
-            # Check API health first
-            if not self.writer_client.health_check():
+            # Check API health first (recent successes are trusted)
+            if not self._gateway_healthy():
                 raise Exception("API Gateway health check failed")
-            
+
             # Send models to API Gateway for database insertion
             result = self.writer_client.replace_all_models(processed_models_data)
-            
+
             self.logger.info(f"Successfully processed models: {result}")
             return result
-            
+
         except Exception as e:
+            # Re-probe health on the next call after a failure
+            self._healthy_until = 0.0
             self.logger.error(f"Error in process_and_store_models: {str(e)}")
             raise
     
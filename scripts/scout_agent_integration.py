@@ -1,12 +1,34 @@
 # scout_agent_integration.py - Integration for Scout Agent with API Gateway
 from writer_agent_client import WriterAgentClient
 import logging
+import time
 
 class ScoutAgentIntegration:
+    # How long a successful health probe stays trusted before re-probing
+    _HEALTH_TRUST_SECONDS = 60
+
     def __init__(self):
         self.writer_client = WriterAgentClient()
         self.logger = logging.getLogger(__name__)
-    
+        self._healthy_until = 0.0
+
+    def _gateway_healthy(self):
+        """Check gateway health, trusting a recent successful probe.
+
+        Avoids paying a health-check round trip before every real call;
+        a failed real call resets the trust window so the next call
+        re-probes.
+        """
+        now = time.monotonic()
+        if now < self._healthy_until:
+            return True
+
+        if self.writer_client.health_check():
+            self._healthy_until = now + self._HEALTH_TRUST_SECONDS
+            return True
+
+        return False
+
     def stage_discovered_urls(self, urls_data):
         """
         Stage URLs discovered by Scout Agent via API Gateway
@@ -27,17 +49,19 @@ class ScoutAgentIntegration:
             
             self.logger.info(f"Staging {len(urls_data)} URLs via API Gateway")
             
-            # Check API health first
-            if not self.writer_client.health_check():
+            # Check API health first (recent successes are trusted)
+            if not self._gateway_healthy():
                 raise Exception("API Gateway health check failed")
-            
+
             # Send URLs to API Gateway for staging
             result = self.writer_client.insert_staging_urls(urls_data)
-            
+
             self.logger.info(f"Successfully staged URLs: {result}")
             return result
-            
+
         except Exception as e:
+            # Re-probe health on the next call after a failure
+            self._healthy_until = 0.0
             self.logger.error(f"Error in stage_discovered_urls: {str(e)}")
             raise
     
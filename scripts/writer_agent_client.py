@@ -1,72 +1,483 @@
 # writer_agent_client.py - Updated to use API Gateway
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import concurrent.futures
+import gzip
+import io
 import os
 import json
+import threading
+import time
+
+# aiohttp is only needed by AsyncWriterAgentClient; the sync client must
+# keep working where it is not installed
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# httpx is only needed by HTTP2WriterAgentClient
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# orjson serializes large model payloads 3-5x faster than stdlib json;
+# fall back to the stdlib when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_dumps(obj) -> bytes:
+    """Encode one value to JSON bytes, preferring orjson."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+class APIError(Exception):
+    """Raised when the API Gateway returns a non-success status.
+
+    Carries the HTTP status and a bounded body snippet so callers can
+    retry selectively without parsing the exception message.
+    """
+
+    def __init__(self, status, snippet):
+        super().__init__(f"API Error: {status} - {snippet}")
+        self.status = status
+        self.snippet = snippet
 
 class WriterAgentClient:
-    def __init__(self):
+    # How long a health_check result stays valid before re-probing
+    _HEALTH_TTL = 30
+
+    def __init__(self, warmup=True):
         self.api_url = os.getenv('AI_MODELS_API_URL', 'https://your-render-service.onrender.com')
         self.api_key = os.getenv('AI_MODELS_DISCOVERY_API_SECRET_KEY')
-        
+
         if not self.api_key:
             raise ValueError("AI_MODELS_DISCOVERY_API_SECRET_KEY environment variable required")
-    
-    def _get_headers(self):
-        return {
+
+        # Pooled keep-alive session: every call targets the same gateway
+        # host, so reusing connections avoids a TCP + TLS handshake per
+        # request. Transient failures retry at the transport layer with
+        # jittered exponential backoff, honoring any Retry-After the
+        # gateway's rate limiter sends. Status-based replays are GET-only:
+        # the gateway does not dedupe POSTs, so a 5xx from a proxy after a
+        # committed write must surface instead of double-writing. POSTs
+        # still retry connect-level failures, where no bytes were sent.
+        # Headers and endpoint URLs are fixed for the client's lifetime, so
+        # build them once instead of per call
+        self._headers = {
             'Authorization': f'Bearer {self.api_key}',
             'Content-Type': 'application/json'
         }
-    
-    def replace_all_models(self, models_data):
-        """Replace all models using API Gateway (clear-and-rebuild)"""
+        self._url_replace = f'{self.api_url}/api/models/replace'
+        self._url_insert = f'{self.api_url}/api/staging/insert'
+        self._url_process = f'{self.api_url}/api/staging/process'
+        self._url_batch = f'{self.api_url}/api/staging/batch'
+        self._url_health = f'{self.api_url}/health'
+
+        self._session = requests.Session()
+        self._session.headers.update(self._headers)
+        retry_kwargs = {
+            'total': 5,
+            'backoff_factor': 0.5,
+            'status_forcelist': [408, 429, 500, 502, 503, 504],
+            'respect_retry_after_header': True,
+            'allowed_methods': frozenset(['GET'])
+        }
         try:
-            payload = {'models': models_data}
-            response = requests.post(
-                f'{self.api_url}/api/models/replace',
-                json=payload,
-                headers=self._get_headers(),
-                timeout=300
-            )
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                raise Exception(f"API Error: {response.status_code} - {response.text}")
-        
-        except Exception as e:
-            print(f"Error calling API: {str(e)}")
-            raise
+            retries = Retry(backoff_jitter=0.5, **retry_kwargs)
+        except TypeError:
+            # urllib3 < 2.0 (still what requests may resolve) has no
+            # backoff_jitter; plain exponential backoff is the fallback
+            retries = Retry(**retry_kwargs)
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=retries
+        )
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+
+        self._health_ok = False
+        self._health_expires = 0.0
+
+        # Whether the gateway supports /api/staging/batch; flipped off on
+        # the first 404/405 so later calls skip the probe
+        self._batch_supported = True
+
+        if warmup:
+            # Probe health in the background so the TLS handshake happens
+            # during constructor time; the primed connection stays in the
+            # pool and the first real call starts at steady-state latency
+            threading.Thread(target=self.health_check, daemon=True).start()
+
+    def close(self):
+        """Release the session's pooled connections."""
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @staticmethod
+    def _check(response):
+        """Decode a successful response body or raise a typed APIError.
+
+        Decoding prefers orjson over requests' stdlib decoder; error
+        snippets are bounded to the first 512 bytes instead of eagerly
+        decoding the whole body with .text.
+        """
+        if response.ok:
+            if orjson is not None:
+                return orjson.loads(response.content)
+            return response.json()
+        raise APIError(response.status_code, response.content[:512].decode('utf-8', 'replace'))
+
+    def _gzip_models_stream(self, models_data):
+        """Yield the gzip-compressed ``{"models": [...]}`` body in chunks.
+
+        Serializes one model at a time straight into the compressor, so
+        the full uncompressed JSON string is never materialized; model
+        metadata typically compresses 5-10x.
+        """
+        buf = io.BytesIO()
+        with gzip.GzipFile(fileobj=buf, mode='wb') as gz:
+            gz.write(b'{"models":[')
+            for i, model in enumerate(models_data):
+                if i:
+                    gz.write(b',')
+                gz.write(_json_dumps(model))
+                if buf.tell() >= 64 * 1024:
+                    yield buf.getvalue()
+                    buf.seek(0)
+                    buf.truncate()
+            gz.write(b']}')
+        yield buf.getvalue()
+
+    def replace_all_models(self, models_data):
+        """Replace all models using API Gateway (clear-and-rebuild)
+
+        The body is always gzip-compressed; the gateway's
+        parse_request_json ships alongside this client in the same repo
+        and understands it, so there is no identity-encoding fallback —
+        deploy both halves together.
+
+        Network failures propagate as requests.RequestException and HTTP
+        failures as APIError; nothing is swallowed or double-logged here.
+        """
+        # Buffer the compressed body so any transport-level resend ships
+        # real bytes, not an exhausted generator. gzip keeps the buffered
+        # size 5-10x below the raw JSON, and the generator still avoids
+        # materializing that string.
+        body = b''.join(self._gzip_models_stream(models_data))
+        response = self._session.post(
+            self._url_replace,
+            data=body,
+            headers={'Content-Encoding': 'gzip'},
+            timeout=300
+        )
+
+        return self._check(response)
     
     def insert_staging_urls(self, urls_data):
         """Insert URLs into staging table via API"""
-        response = requests.post(
-            f'{self.api_url}/api/staging/insert',
-            json={'urls': urls_data},
-            headers=self._get_headers()
+        response = self._session.post(
+            self._url_insert,
+            json={'urls': urls_data}
         )
-        
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise Exception(f"Staging API Error: {response.status_code} - {response.text}")
+
+        return self._check(response)
     
     def process_staging_data(self, limit=10):
         """Process staging data via API"""
-        response = requests.post(
-            f'{self.api_url}/api/staging/process',
-            json={'limit': limit},
-            headers=self._get_headers()
+        response = self._session.post(
+            self._url_process,
+            json={'limit': limit}
         )
-        
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise Exception(f"Process API Error: {response.status_code} - {response.text}")
-    
+
+        return self._check(response)
+
+    def insert_and_process(self, urls_data, limit=10):
+        """Insert staging URLs and process them in one round trip.
+
+        Ships both calls to the gateway's /api/staging/batch endpoint,
+        which runs them sequentially server-side, halving round trips on
+        the common ingest path. Gateways without the endpoint (404/405)
+        get the classic two-call sequence; that detection is cached on
+        the instance so the probe is paid once.
+        """
+        if self._batch_supported:
+            response = self._session.post(
+                self._url_batch,
+                json={'calls': [
+                    {'op': 'insert', 'urls': urls_data},
+                    {'op': 'process', 'limit': limit, 'depends_on': 0}
+                ]}
+            )
+
+            if response.status_code not in (404, 405):
+                return self._check(response)
+            self._batch_supported = False
+
+        return {
+            'status': 'success',
+            'operation': 'staging_batch',
+            'results': [
+                self.insert_staging_urls(urls_data),
+                self.process_staging_data(limit)
+            ]
+        }
+
+    def drain_staging(self, total, chunk=10, workers=8, stop_on_empty=True):
+        """Process up to ``total`` staged records with parallel gateway calls.
+
+        Submits ceil(total/chunk) process_staging_data calls to a bounded
+        thread pool; the pooled session reuses its keep-alive connections,
+        so drain throughput scales with the worker count instead of paying
+        one RTT per sequential call. With stop_on_empty, pending calls are
+        cancelled once a worker reports an empty batch (the table drained
+        early).
+
+        Returns a dict with aggregate 'records_processed' and 'calls'.
+        """
+        num_calls = max(1, -(-total // chunk))
+        totals = {'records_processed': 0, 'calls': 0}
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self.process_staging_data, chunk)
+                for _ in range(num_calls)
+            ]
+            for future in concurrent.futures.as_completed(futures):
+                if future.cancelled():
+                    continue
+                result = future.result()
+                processed = result.get('records_processed', 0)
+                totals['records_processed'] += processed
+                totals['calls'] += 1
+                if stop_on_empty and processed == 0:
+                    for pending in futures:
+                        pending.cancel()
+
+        return totals
+
+    def health_check(self):
+        """Check API Gateway health (result cached for a short TTL).
+
+        Runs over the pooled session, so a successful probe leaves a warm
+        connection behind for the next real call.
+        """
+        now = time.monotonic()
+        if now < self._health_expires:
+            return self._health_ok
+
+        try:
+            response = self._session.get(self._url_health, timeout=30)
+            self._health_ok = response.status_code == 200
+        except requests.RequestException:
+            self._health_ok = False
+
+        self._health_expires = now + self._HEALTH_TTL
+        return self._health_ok
+
+
+class StagingBatcher:
+    """Buffer staging URLs and flush them to the gateway in batches.
+
+    Producers that discover URLs one at a time would otherwise pay the
+    full per-request overhead (TLS, auth, server-side JSON parse) per
+    URL. The batcher collapses those into one POST per batch: a flush
+    happens when the buffer reaches max_batch items, when max_wait_ms
+    elapses after the first buffered item, or on close(). A larger
+    max_batch favors throughput; a smaller max_wait_ms bounds how long
+    an item can sit unsent.
+    """
+
+    def __init__(self, client, max_batch=500, max_wait_ms=250):
+        self._client = client
+        self._max_batch = max_batch
+        self._max_wait = max_wait_ms / 1000.0
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def add(self, url_data):
+        """Queue one staging record; may trigger a size-based flush."""
+        with self._lock:
+            self._buffer.append(url_data)
+            if len(self._buffer) >= self._max_batch:
+                batch = self._take_locked()
+            else:
+                if self._timer is None:
+                    self._timer = threading.Timer(self._max_wait, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+                return
+        self._client.insert_staging_urls(batch)
+
+    def _take_locked(self):
+        """Swap out the buffer and cancel the pending timer (lock held)."""
+        batch = self._buffer
+        self._buffer = []
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return batch
+
+    def flush(self):
+        """Send whatever is buffered now."""
+        with self._lock:
+            batch = self._take_locked()
+        if batch:
+            self._client.insert_staging_urls(batch)
+
+    def close(self):
+        """Flush any remaining records synchronously."""
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class HTTP2WriterAgentClient:
+    """Writer client over a single multiplexed HTTP/2 connection.
+
+    With HTTP/1.1 keep-alive, concurrent calls still need one TCP
+    connection per in-flight request; HTTP/2 multiplexes them as streams
+    over one TLS connection, which suits gateways behind a CDN or load
+    balancer that prefer few long-lived connections. Interface matches
+    WriterAgentClient's four gateway calls.
+    """
+
+    def __init__(self):
+        if httpx is None:
+            raise ImportError("httpx is required for HTTP2WriterAgentClient")
+
+        self.api_url = os.getenv('AI_MODELS_API_URL', 'https://your-render-service.onrender.com')
+        self.api_key = os.getenv('AI_MODELS_DISCOVERY_API_SECRET_KEY')
+
+        if not self.api_key:
+            raise ValueError("AI_MODELS_DISCOVERY_API_SECRET_KEY environment variable required")
+
+        self._client = httpx.Client(
+            base_url=self.api_url,
+            http2=True,
+            headers={
+                'Authorization': f'Bearer {self.api_key}',
+                'Content-Type': 'application/json'
+            },
+            timeout=300.0,
+            limits=httpx.Limits(max_connections=4, max_keepalive_connections=4)
+        )
+
+    def close(self):
+        """Close the HTTP/2 connection."""
+        self._client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @staticmethod
+    def _check(response):
+        if response.status_code != 200:
+            raise APIError(response.status_code, response.content[:512].decode('utf-8', 'replace'))
+        if orjson is not None:
+            return orjson.loads(response.content)
+        return response.json()
+
+    def replace_all_models(self, models_data):
+        """Replace all models using API Gateway (clear-and-rebuild)"""
+        return self._check(self._client.post('/api/models/replace', json={'models': models_data}))
+
+    def insert_staging_urls(self, urls_data):
+        """Insert URLs into staging table via API"""
+        return self._check(self._client.post('/api/staging/insert', json={'urls': urls_data}))
+
+    def process_staging_data(self, limit=10):
+        """Process staging data via API"""
+        return self._check(self._client.post('/api/staging/process', json={'limit': limit}))
+
     def health_check(self):
         """Check API Gateway health"""
         try:
-            response = requests.get(f'{self.api_url}/health', timeout=30)
-            return response.status_code == 200
-        except:
+            return self._client.get('/health', timeout=30.0).status_code == 200
+        except httpx.HTTPError:
+            return False
+
+
+class AsyncWriterAgentClient:
+    """Async variant of WriterAgentClient for concurrent gateway calls.
+
+    Use as an async context manager; independent calls can then be issued
+    concurrently, e.g.:
+
+        async with AsyncWriterAgentClient() as client:
+            await asyncio.gather(*[client.insert_staging_urls(b) for b in batches])
+    """
+
+    def __init__(self):
+        if aiohttp is None:
+            raise ImportError("aiohttp is required for AsyncWriterAgentClient")
+
+        self.api_url = os.getenv('AI_MODELS_API_URL', 'https://your-render-service.onrender.com')
+        self.api_key = os.getenv('AI_MODELS_DISCOVERY_API_SECRET_KEY')
+
+        if not self.api_key:
+            raise ValueError("AI_MODELS_DISCOVERY_API_SECRET_KEY environment variable required")
+
+        self._session = None
+
+    async def __aenter__(self):
+        self._session = aiohttp.ClientSession(
+            base_url=self.api_url,
+            headers={
+                'Authorization': f'Bearer {self.api_key}',
+                'Content-Type': 'application/json'
+            },
+            timeout=aiohttp.ClientTimeout(total=300),
+            connector=aiohttp.TCPConnector(limit=20, ttl_dns_cache=300)
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self._session.close()
+
+    async def replace_all_models(self, models_data):
+        """Replace all models using API Gateway (clear-and-rebuild)"""
+        async with self._session.post('/api/models/replace', json={'models': models_data}) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    async def insert_staging_urls(self, urls_data):
+        """Insert URLs into staging table via API"""
+        async with self._session.post('/api/staging/insert', json={'urls': urls_data}) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    async def process_staging_data(self, limit=10):
+        """Process staging data via API"""
+        async with self._session.post('/api/staging/process', json={'limit': limit}) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    async def health_check(self):
+        """Check API Gateway health"""
+        try:
+            async with self._session.get('/health') as response:
+                return response.status == 200
+        except aiohttp.ClientError:
             return False
\ No newline at end of file